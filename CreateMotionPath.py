@@ -28,8 +28,23 @@ bl_info = {
 
 import bpy
 import bmesh
+import numpy as np
 from mathutils import Vector
 
+# Numba is optional, the transform kernel below falls back to plain numpy
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _on_radius_change(self, context):
+    # Only runs when the radius is edited, not on every depsgraph update
+    scale_factor = self.icosphere_radius
+    for obj in self.id_data.objects:
+        if "motion_path_addon_sphere" in obj and obj["motion_path_addon_sphere"]:
+            obj.scale = (scale_factor, scale_factor, scale_factor)
+
 
 class MotionPathSettings(bpy.types.PropertyGroup):
     use_timeline: bpy.props.BoolProperty(
@@ -54,7 +69,8 @@ class MotionPathSettings(bpy.types.PropertyGroup):
         description="Radius of the icosphere",
         default=0.2,
         min=0.001,
-        max=1.0
+        max=1.0,
+        update=_on_radius_change
     )
     icosphere_color: bpy.props.FloatVectorProperty(
         name="Icosphere Color",
@@ -64,27 +80,34 @@ class MotionPathSettings(bpy.types.PropertyGroup):
         max=1.0,
         subtype='COLOR'
     )
+    max_instanced_spheres: bpy.props.IntProperty(
+        name="Max Spheres",
+        description="Longer paths only get a curve, without a sphere per frame",
+        default=500,
+        min=1
+    )
 
-def update_icospheres(scene):
-    settings = scene.motion_path_settings
-    for obj in scene.objects:
-        if "motion_path_addon_sphere" in obj and obj["motion_path_addon_sphere"]:
-            # Assuming the original scale corresponds to the original radius of 0.01
-            scale_factor = settings.icosphere_radius
-            obj.scale = (scale_factor, scale_factor, scale_factor)
-
-# Register the handler
-bpy.app.handlers.depsgraph_update_post.append(update_icospheres)
-    
 def set_viewport_shading_to_object_color():
+    if bpy.context.screen is None:
+        return
     for area in bpy.context.screen.areas: 
         if area.type == 'VIEW_3D':
             for space in area.spaces:
                 if space.type == 'VIEW_3D':
-                    space.shading.type = 'SOLID'
-                    space.shading.color_type = 'OBJECT'
+                    # Only write the shading when it is not already set up, the
+                    # user may also have switched this viewport back since
+                    if space.shading.type != 'SOLID' or space.shading.color_type != 'OBJECT':
+                        space.shading.type = 'SOLID'
+                        space.shading.color_type = 'OBJECT'
                     break    
 
+def tag_viewports_for_redraw():
+    if bpy.context.screen is None:
+        return
+    for area in bpy.context.screen.areas:
+        if area.type == 'VIEW_3D':
+            area.tag_redraw()
+
 def get_frame_range(context):
     settings = context.scene.motion_path_settings
     if settings.use_timeline:
@@ -92,74 +115,253 @@ def get_frame_range(context):
     else:
         return settings.start_frame, settings.end_frame
 
+def build_icosphere_tables(subdivisions):
+    # Unit icosahedron, each face split in four per extra subdivision level
+    # (subdivisions=1 is the plain icosahedron, as in primitive_ico_sphere_add)
+    t = (1.0 + 5.0 ** 0.5) / 2.0
+    verts = [(-1, t, 0), (1, t, 0), (-1, -t, 0), (1, -t, 0),
+             (0, -1, t), (0, 1, t), (0, -1, -t), (0, 1, -t),
+             (t, 0, -1), (t, 0, 1), (-t, 0, -1), (-t, 0, 1)]
+    verts = [Vector(v).normalized() for v in verts]
+    faces = [(0, 11, 5), (0, 5, 1), (0, 1, 7), (0, 7, 10), (0, 10, 11),
+             (1, 5, 9), (5, 11, 4), (11, 10, 2), (10, 7, 6), (7, 1, 8),
+             (3, 9, 4), (3, 4, 2), (3, 2, 6), (3, 6, 8), (3, 8, 9),
+             (4, 9, 5), (2, 4, 11), (6, 2, 10), (8, 6, 7), (9, 8, 1)]
+
+    for _ in range(subdivisions - 1):
+        midpoints = {}
+
+        def midpoint(a, b):
+            key = (min(a, b), max(a, b))
+            if key not in midpoints:
+                verts.append(((verts[a] + verts[b]) / 2.0).normalized())
+                midpoints[key] = len(verts) - 1
+            return midpoints[key]
+
+        new_faces = []
+        for a, b, c in faces:
+            ab, bc, ca = midpoint(a, b), midpoint(b, c), midpoint(c, a)
+            new_faces += [(a, ab, ca), (b, bc, ab), (c, ca, bc), (ab, bc, ca)]
+        faces = new_faces
+
+    return (np.array(verts, dtype=np.float32),
+            np.array(faces, dtype=np.int32))
+
+# Same topology as primitive_ico_sphere_add(subdivisions=2): 42 verts, 80 faces.
+# The mesh keeps the 0.2 radius spheres have always had, the Radius setting
+# scales the object on top of it.
+_ICO_VERTS, _ICO_FACES = build_icosphere_tables(2)
+_ICO_VERTS *= 0.2
+
+# Shared by every path sphere, the geometry only differs by object scale.
+# Only the name is kept: undo and file loads free the datablock underneath
+# any Python reference to it.
+_BASE_ICO_MESH_NAME = None
+
+def build_icosphere_mesh():
+    n_faces = len(_ICO_FACES)
+    mesh = bpy.data.meshes.new('BaseIcoSphere')
+    mesh.vertices.add(len(_ICO_VERTS))
+    mesh.vertices.foreach_set("co", _ICO_VERTS.ravel())
+    mesh.loops.add(_ICO_FACES.size)
+    mesh.loops.foreach_set("vertex_index", _ICO_FACES.ravel())
+    mesh.polygons.add(n_faces)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, _ICO_FACES.size, 3, dtype=np.int32))
+    # loop_total is derived from loop_start in newer Blender versions
+    if not bpy.types.MeshPolygon.bl_rna.properties['loop_total'].is_readonly:
+        mesh.polygons.foreach_set("loop_total", np.full(n_faces, 3, dtype=np.int32))
+
+    # Set shading to smooth
+    mesh.polygons.foreach_set("use_smooth", np.ones(n_faces, dtype=bool))
+    mesh.update(calc_edges=True)
+    mesh["motion_path_addon_mesh"] = True
+    return mesh
+
+def get_icosphere_mesh():
+    global _BASE_ICO_MESH_NAME
+    # The datablock may have been purged or renamed, or a new file loaded
+    mesh = bpy.data.meshes.get(_BASE_ICO_MESH_NAME) if _BASE_ICO_MESH_NAME else None
+    if mesh is None or not mesh.get("motion_path_addon_mesh"):
+        mesh = build_icosphere_mesh()
+        _BASE_ICO_MESH_NAME = mesh.name
+    return mesh
+
 def create_base_icosphere(radius, color):
-    bpy.ops.mesh.primitive_ico_sphere_add(subdivisions=2, radius=0.2, location=(0, 0, 0))
-    base_sphere = bpy.context.object
-    base_sphere.name = 'BaseIcoSphere'
+    mesh = get_icosphere_mesh()
+    # Linked to the scene by the caller, together with the rest of the path
+    base_sphere = bpy.data.objects.new('BaseIcoSphere', mesh)
     base_sphere["motion_path_addon_sphere"] = True
+    base_sphere.scale = (radius, radius, radius)
     base_sphere.hide_render = True
 
     # Set the viewport display color
     rgba_color = (color[0], color[1], color[2], 1.0)
     base_sphere.color = rgba_color
 
-    # Set shading to smooth
-    bpy.context.view_layer.objects.active = base_sphere
-    bpy.ops.object.shade_smooth()
-
     return base_sphere
 
 
-def calculate_geometric_center(obj):
-    local_vertices = [vertex.co for vertex in obj.data.vertices]
-    n = len(local_vertices)
-    mean = sum(local_vertices, Vector()) / n
-    return obj.matrix_world @ mean
+# Transforms the (paths, frames, 4) local points by the per-frame world
+# matrices into out, for every path at once
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _transform_batch(mats, locals_, out):
+        for k in range(locals_.shape[0]):
+            for i in range(mats.shape[0]):
+                for r in range(4):
+                    acc = 0.0
+                    for c in range(4):
+                        acc += mats[i, r, c] * locals_[k, i, c]
+                    out[k, i, r] = acc
+else:
+    def _transform_batch(mats, locals_, out):
+        out[:] = np.einsum('nij,knj->kni', mats, locals_)
 
-def create_motion_path(obj, start_frame, end_frame, world_matrix, is_vertex=False, is_bone=False, is_empty=False):
-    settings = bpy.context.scene.motion_path_settings
-    base_sphere = create_base_icosphere(settings.icosphere_radius, settings.icosphere_color)
 
+def calculate_geometric_center(obj):
+    n = len(obj.data.vertices)
+    local_vertices = np.empty(n * 3, dtype=np.float32)
+    obj.data.vertices.foreach_get("co", local_vertices)
+    mean = local_vertices.reshape(n, 3).mean(axis=0)
+    return obj.matrix_world @ Vector(mean)
+
+# Creates the curve, instancer and sphere for one sampled path. The objects
+# are returned unlinked so the caller can link them all together.
+def build_motion_path(coords, settings):
     curve_data = bpy.data.curves.new('motion_path_curve', type='CURVE')
     curve_data.dimensions = '3D'
     curve_data.resolution_u = 2
 
+    # A new spline already holds one point, grow it to the final size once.
+    # The curve data is complete before any object uses it.
+    polyline = curve_data.splines.new('POLY')
+    points = polyline.points
+    points.add(len(coords) - 1)
+    points.foreach_set("co", coords.ravel())
+
     curve_object = bpy.data.objects.new('motion_path', curve_data)
-    bpy.context.scene.collection.objects.link(curve_object)
     curve_object['is_motion_path'] = True
 
-    polyline = curve_data.splines.new('POLY')
-    polyline.points.add(end_frame - start_frame)
+    # A single mesh with one vertex per sample instances the sphere,
+    # instead of one sphere object and mesh per frame. Past the sphere limit
+    # the mesh only keeps the sample points and nothing is instanced.
+    instancer_mesh = bpy.data.meshes.new('mp_instancer')
+    instancer_mesh.vertices.add(len(coords))
+    instancer_mesh.vertices.foreach_set("co", coords[:, 0:3].ravel())
+    instancer_mesh.update()
 
-    for frame in range(start_frame, end_frame + 1):
+    instancer_obj = bpy.data.objects.new('mp_instancer', instancer_mesh)
+    instancer_obj['is_motion_path'] = True
+    instancer_obj.parent = curve_object
+    if len(coords) > settings.max_instanced_spheres:
+        return curve_object, instancer_obj
+
+    base_sphere = create_base_icosphere(settings.icosphere_radius, settings.icosphere_color)
+    instancer_obj.instance_type = 'VERTS'
+    base_sphere.parent = instancer_obj
+
+    return curve_object, instancer_obj, base_sphere
+
+# Evaluates the location F-curves directly when nothing else can move the
+# object's origin, so no frame changes are needed. Returns None otherwise.
+def sample_location_fcurves(obj, start_frame, end_frame):
+    anim = obj.animation_data
+    if anim is None or anim.action is None or obj.parent or obj.constraints or obj.rigid_body:
+        return None
+    if anim.nla_tracks or getattr(anim, "action_influence", 1.0) != 1.0 \
+            or getattr(anim, "action_blend_type", 'REPLACE') != 'REPLACE':
+        return None
+    if any(driver.data_path in {'location', 'delta_location'} for driver in anim.drivers):
+        return None
+    # fcurve.evaluate() works in action frames and ignores time remapping
+    render = bpy.context.scene.render
+    if render.frame_map_old != render.frame_map_new:
+        return None
+    # On slotted actions the flat F-curve list only covers the first slot, so
+    # an object using any other slot, or no slot at all, takes the slow path.
+    # Without the list at all (Blender 5.0+) it always does.
+    fcurves = getattr(anim.action, "fcurves", None)
+    if hasattr(anim, "action_slot"):
+        slot = anim.action_slot
+        if slot is None or not anim.action.slots or slot != anim.action.slots[0]:
+            return None
+    if fcurves is None or any(fc.data_path == 'delta_location' for fc in fcurves):
+        return None
+
+    n = end_frame - start_frame + 1
+    coords = np.ones((1, n, 4), dtype=np.float32)
+    # Channels without an F-curve keep their current value
+    coords[0, :, 0:3] = np.add(obj.location, obj.delta_location)
+    frames = range(start_frame, end_frame + 1)
+    for fc in fcurves:
+        if fc.data_path != 'location' or fc.mute or (fc.group and fc.group.mute):
+            continue
+        # Blender skips curves with nothing to evaluate, the channel keeps its
+        # current value where evaluate() would return 0
+        if len(fc.keyframe_points) == 0 and len(fc.modifiers) == 0:
+            continue
+        values = np.fromiter((fc.evaluate(f) for f in frames), dtype=np.float32, count=n)
+        coords[0, :, fc.array_index] = values + obj.delta_location[fc.array_index]
+    return coords
+
+# Steps through the frames and records the world matrix and, for bones, the
+# local sample point, then transforms every sample at once
+def sample_frames(obj, start_frame, end_frame, locals_, is_bone):
+    n = end_frame - start_frame + 1
+    world_mats = np.empty((n, 4, 4), dtype=np.float32)
+    for i, frame in enumerate(range(start_frame, end_frame + 1)):
         bpy.context.scene.frame_set(frame)
-        if is_empty:
-            position = obj.matrix_world.translation
-        elif is_vertex:
-            # For vertices, ensure obj is a mesh type
-            if obj.type == 'MESH':
-                position = world_matrix @ obj.data.vertices[is_vertex].co
-            else:
-                continue  # Skip if obj is not a mesh
-        elif is_bone:
-            # For bones, ensure obj is an armature
-            if obj.type == 'ARMATURE':
-                bone = obj.pose.bones[is_bone]
-                position = world_matrix @ bone.head  # Use head or tail as needed
-            else:
-                continue  # Skip if obj is not an armature
-        else:  # General object
-            position = obj.matrix_world.translation
+        world_mats[i] = obj.matrix_world
+        if is_bone:
+            locals_[0, i, 0:3] = obj.pose.bones[is_bone].head  # Use head or tail as needed
 
-        polyline.points[frame - start_frame].co = (position[0], position[1], position[2], 1)
+    # Curve points are (x, y, z, w) and the result stays float32 to match
+    # the RNA storage for foreach_set
+    coords = np.empty(locals_.shape, dtype=np.float32)
+    _transform_batch(world_mats, locals_, coords)
+    return coords
 
-        sphere_instance = base_sphere.copy()
-        sphere_instance.data = base_sphere.data.copy()
-        sphere_instance.location = position
-        sphere_instance.parent = curve_object
-        bpy.context.scene.collection.objects.link(sphere_instance)
+def create_motion_path(obj, start_frame, end_frame, is_vertex=None, is_bone=False):
+    settings = bpy.context.scene.motion_path_settings
 
-    base_sphere.hide_set(True)
+    if is_vertex is not None:
+        # For vertices, ensure obj is a mesh type
+        if obj.type != 'MESH':
+            return  # Skip if obj is not a mesh
+        # One path per vertex index, all sampled in the same frame sweep
+        indices = [is_vertex] if isinstance(is_vertex, (int, np.integer)) else list(is_vertex)
+        n_verts = len(obj.data.vertices)
+        all_co = np.empty(n_verts * 3, dtype=np.float32)
+        obj.data.vertices.foreach_get("co", all_co)
+        local_co = all_co.reshape(n_verts, 3)[indices]
+    elif is_bone and obj.type != 'ARMATURE':
+        return  # Skip if obj is not an armature
+    n_paths = len(indices) if is_vertex is not None else 1
+
+    n = end_frame - start_frame + 1
+    # Local points are homogeneous; objects and empties sample their origin
+    locals_ = np.zeros((n_paths, n, 4), dtype=np.float32)
+    locals_[:, :, 3] = 1.0
+    if is_vertex is not None:
+        locals_[:, :, 0:3] = local_co[:, np.newaxis, :]
+
+    coords = None
+    if is_vertex is None and not is_bone:
+        coords = sample_location_fcurves(obj, start_frame, end_frame)
+    if coords is None:
+        coords = sample_frames(obj, start_frame, end_frame, locals_, is_bone)
+
+    # Build every path from the sampled positions, with no further frame changes
+    new_objects = []
+    for path_coords in coords:
+        new_objects.extend(build_motion_path(path_coords, settings))
+
+    # Link everything in one pass once the objects are fully set up, then
+    # redraw the viewports once for the whole batch
+    link = bpy.context.scene.collection.objects.link
+    for new_obj in new_objects:
+        link(new_obj)
+    tag_viewports_for_redraw()
 
 class BonePathOperator(bpy.types.Operator):
     bl_idname = "object.bone_path"
@@ -170,7 +372,7 @@ class BonePathOperator(bpy.types.Operator):
         bone = context.active_pose_bone
         if armature and armature.type == 'ARMATURE' and bone:
             start_frame, end_frame = get_frame_range(context)
-            create_motion_path(armature, start_frame, end_frame, armature.matrix_world, is_bone=bone.name)
+            create_motion_path(armature, start_frame, end_frame, is_bone=bone.name)
             self.report({'INFO'}, "Bone motion path created")
         else:
             self.report({'ERROR'}, "No active bone in selected armature")
@@ -186,11 +388,14 @@ class VertexPathOperator(bpy.types.Operator):
         if obj and obj.type == 'MESH':
             if bpy.ops.object.mode_set.poll():
                 bpy.ops.object.mode_set(mode='OBJECT')
-            selected_verts = [v for v in obj.data.vertices if v.select]
-            if selected_verts:
+            n = len(obj.data.vertices)
+            selection = np.empty(n, dtype=bool)
+            obj.data.vertices.foreach_get("select", selection)
+            selected_verts = np.flatnonzero(selection)
+            if selected_verts.size:
                 start_frame, end_frame = get_frame_range(context)
-                # Pass the vertex index directly
-                create_motion_path(obj, start_frame, end_frame, obj.matrix_world, is_vertex=selected_verts[0].index)
+                # One path per selected vertex, sampled in a single pass
+                create_motion_path(obj, start_frame, end_frame, is_vertex=selected_verts.tolist())
                 if bpy.ops.object.mode_set.poll():
                     bpy.ops.object.mode_set(mode='EDIT')
                 self.report({'INFO'}, "Vertex motion path created")
@@ -209,7 +414,7 @@ class EmptyPathOperator(bpy.types.Operator):
         obj = context.active_object
         if obj and obj.type == 'EMPTY':
             start_frame, end_frame = get_frame_range(context)
-            create_motion_path(obj, start_frame, end_frame, obj.matrix_world, "location", is_empty=True)
+            create_motion_path(obj, start_frame, end_frame)
             self.report({'INFO'}, "Empty motion path created")
         else:
             self.report({'ERROR'}, "No empty object selected")
@@ -225,7 +430,7 @@ class ObjectPathOperator(bpy.types.Operator):
         obj = context.active_object
         if obj and obj.type in {'MESH', 'CURVE', 'SURFACE', 'FONT'}:  # Add other types as needed
             start_frame, end_frame = get_frame_range(context)
-            create_motion_path(obj, start_frame, end_frame, obj.matrix_world)
+            create_motion_path(obj, start_frame, end_frame)
             self.report({'INFO'}, "Object motion path created")
         else:
             self.report({'ERROR'}, "No suitable object selected")
@@ -240,21 +445,15 @@ class CleanUpOperator(bpy.types.Operator):
         icospheres_to_delete = set()
         curves_to_delete = set()
 
-        # Collect icospheres and curves
+        # Collect icospheres, curves and instancers
         for obj in bpy.data.objects:
             if "motion_path_addon_sphere" in obj and obj["motion_path_addon_sphere"]:
                 icospheres_to_delete.add(obj)
-                if obj.parent and 'is_motion_path' in obj.parent:
-                    curves_to_delete.add(obj.parent)
-
-        # Delete the icospheres
-        for icosphere in icospheres_to_delete:
-            bpy.data.objects.remove(icosphere, do_unlink=True)
+            elif 'is_motion_path' in obj:
+                curves_to_delete.add(obj)
 
-        # Delete the curves
-        for curve in curves_to_delete:
-            if curve.name in bpy.data.objects:  # Ensure the curve still exists
-                bpy.data.objects.remove(curve, do_unlink=True)
+        # Delete the icospheres and curves in a single pass
+        bpy.data.batch_remove(ids=list(icospheres_to_delete | curves_to_delete))
 
         self.report({'INFO'}, "Motion path curves and addon spheres cleaned up")
         return {'FINISHED'}
@@ -277,13 +476,24 @@ class MotionPathPanel(bpy.types.Panel):
             layout.prop(settings, "end_frame")
         layout.prop(settings, "icosphere_radius")  # Add radius control to the UI
         layout.prop(settings, "icosphere_color", text="Color")
+        layout.prop(settings, "max_instanced_spheres")
         layout.operator("object.bone_path")
         layout.operator("object.vertex_path")
         layout.operator("object.empty_path")
         layout.operator("object.object_path")
         layout.operator("object.clean_up_motion_path")
 
+def remove_legacy_handlers():
+    # Earlier versions appended update_icospheres to depsgraph_update_post at
+    # import time and never removed it. A leftover copy from a reload would
+    # still scan the whole scene on every frame_set of a path sweep.
+    handlers = bpy.app.handlers.depsgraph_update_post
+    for handler in list(handlers):
+        if getattr(handler, "__module__", None) == __name__ and handler.__name__ == "update_icospheres":
+            handlers.remove(handler)
+
 def register():
+    remove_legacy_handlers()
     bpy.utils.register_class(MotionPathSettings)
     bpy.types.Scene.motion_path_settings = bpy.props.PointerProperty(type=MotionPathSettings)
     bpy.utils.register_class(BonePathOperator)
@@ -300,10 +510,9 @@ def unregister():
     bpy.utils.unregister_class(BonePathOperator)
     bpy.utils.unregister_class(VertexPathOperator)
     bpy.utils.unregister_class(ObjectPathOperator)
-    bpy.utils.register_class(EmptyPathOperator)
+    bpy.utils.unregister_class(EmptyPathOperator)
     bpy.utils.unregister_class(CleanUpOperator)
     bpy.utils.unregister_class(MotionPathPanel)
-    bpy.utils.unregister_class(UpdateRadiusOperator)
 
 if __name__ == "__main__":
     register()